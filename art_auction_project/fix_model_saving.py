@@ -5,8 +5,16 @@ Run this after training your model in the notebook
 
 import joblib
 import json
+import os
+import shutil
 from pathlib import Path
 
+# Optional fast JSON encoder (serializes numpy types natively)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def fix_model_saving(best_model, best_model_name, best_r2, X_train_cb, X_train_sk, categorical_cols):
     """
     Properly save the model with all 57 features and feature information
@@ -19,7 +27,10 @@ def fix_model_saving(best_model, best_model_name, best_r2, X_train_cb, X_train_s
     artifacts_dir = Path("artifacts")
     artifacts_dir.mkdir(exist_ok=True)
 
-    # Save the model
+    # Save the model uncompressed: the backend loads it with mmap_mode='r'
+    # so uvicorn workers share the pickle's pages, and joblib cannot
+    # memory-map a compressed artifact (it warns and loads eagerly per
+    # worker instead)
     model_path = artifacts_dir / "art_price_model.pkl"
     joblib.dump(best_model, model_path)
     print(f"✅ Model saved to: {model_path}")
@@ -48,13 +59,25 @@ def fix_model_saving(best_model, best_model_name, best_r2, X_train_cb, X_train_s
     }
 
     feature_info_path = artifacts_dir / "feature_info.json"
-    with open(feature_info_path, 'w') as f:
-        json.dump(feature_info, f, indent=2)
+    if orjson is not None:
+        feature_info_path.write_bytes(
+            orjson.dumps(feature_info, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        )
+    else:
+        with open(feature_info_path, 'w') as f:
+            json.dump(feature_info, f, indent=2)
     print(f"✅ Feature info saved to: {feature_info_path}")
 
-    # Save preprocessor (same as model for now)
+    # Save preprocessor (same as model for now): hardlink to the model file
+    # instead of pickling a potentially multi-hundred-MB object twice
     preprocessor_path = artifacts_dir / "preprocessor.pkl"
-    joblib.dump(best_model, preprocessor_path)
+    if preprocessor_path.exists():
+        preprocessor_path.unlink()
+    try:
+        os.link(model_path, preprocessor_path)
+    except OSError:
+        # Cross-device or Windows without link support: fall back to a byte copy
+        shutil.copyfile(model_path, preprocessor_path)
     print(f"✅ Preprocessor saved to: {preprocessor_path}")
 
     print(f"\n📊 Model details:")
@@ -1,7 +1,8 @@
 """
 Configuration management for ArtifexAI Backend
 """
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from functools import lru_cache
 from typing import List
 import os
 from pathlib import Path
@@ -17,7 +18,10 @@ class Settings(BaseSettings):
     # Server
     host: str = "0.0.0.0"
     port: int = 8000
-    reload: bool = True
+    # Off by default: the autoreload file-watcher is a dev-only convenience
+    # and costs a polling thread plus full interpreter restarts in prod.
+    # Developers opt in with RELOAD=1 in the environment or .env.
+    reload: bool = False
     
     # CORS
     cors_origins: List[str] = [
@@ -49,13 +53,23 @@ class Settings(BaseSettings):
     # Logging
     log_level: str = "INFO"
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        frozen=True,
+    )
 
-# Global settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Memoized settings: env vars and .env are validated once per process.
+
+    FastAPI routes can take `settings: Settings = Depends(get_settings)`.
+    """
+    return Settings()
+
+# Global settings instance (kept for direct-import callers)
+settings = get_settings()
 
 # Ensure data directory exists
 data_dir = Path("data")
@@ -1,14 +1,77 @@
 import os
 import io
-import time
 import json
+import time
 import base64
+import hashlib
+import concurrent.futures
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any, Dict, Tuple, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import streamlit as st
-from PIL import Image
+
+# Optional streaming multipart encoder: requests assembles the whole
+# multipart body in memory before sending, while the toolbelt encoder
+# yields it in chunks, so big uploads don't double peak RSS on the wire
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
+# Heavyweight clients are pinned with st.cache_resource so long-lived Streamlit
+# sessions reuse one socket pool / thread pool per process instead of leaking
+# them across reruns.
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """Process-wide HTTP session with keep-alive pooling and adapter-level retries.
+
+    requests over HTTP/1.1 keep-alive is deliberate: the backend is a
+    local uvicorn speaking HTTP/1.1, so an HTTP/2 client would negotiate
+    nothing and add a dependency for the same pooled sockets.
+    """
+    s = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.2,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=["GET", "POST"],
+        ),
+    )
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    return s
+
+@st.cache_resource
+def get_upload_session() -> requests.Session:
+    """Session for streamed multipart uploads: connection retries only.
+
+    A status-based retry would make urllib3 try to rewind the consumed
+    one-shot encoder body and fail mid-upload; _post_multipart re-issues
+    transient statuses itself with a fresh encoder per attempt.
+    """
+    s = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(connect=2, read=0, status=0, backoff_factor=0.2),
+    )
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    return s
+
+@st.cache_resource
+def get_executor() -> ThreadPoolExecutor:
+    """Process-wide worker pool for firing independent backend requests concurrently."""
+    return ThreadPoolExecutor(max_workers=4)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # CONFIG
@@ -34,12 +97,27 @@ config = FrontendConfig()
 API = {
     "health": f"{config.API_BASE_URL}/health",
     "predict": f"{config.API_BASE_URL}/predict",
+    "predict_with_image": f"{config.API_BASE_URL}/predict-with-image",
     "analyze_image": f"{config.API_BASE_URL}/analyze-image",
     "model_info": f"{config.API_BASE_URL}/model/info",
 }
 
-def get_starry_night_base64():
-    """Convert The Starry Night image to base64 for embedding"""
+# Selectbox options as module-level tuples: immutable, built once instead of a
+# fresh list object per rerun, and stable for Streamlit's widget diffing.
+UNITS = ("cm", "inches")
+OBJECT_TYPES = ("other", "painting", "drawing", "print", "sculpture", "photograph")
+TECHNIQUES = ("other", "oil on canvas", "watercolor", "etching", "lithograph", "woodcut", "screenprint", "painting")
+SIGNATURES = ("unknown", "hand signed", "plate signed", "unsigned")
+CONDITIONS = ("unknown", "excellent", "very good", "good", "fair", "poor")
+EDITION_TYPES = ("unknown", "unique", "numbered", "limited", "open")
+
+@st.cache_data(show_spinner=False)
+def get_starry_night_base64() -> str:
+    """Convert The Starry Night image to base64 for embedding.
+
+    Cached: the hero renders on every rerun, and re-reading plus
+    re-encoding the JPEG each widget interaction would dominate it.
+    """
     try:
         image_path = "img/night.jpg"
         if os.path.exists(image_path):
@@ -53,30 +131,113 @@ def get_starry_night_base64():
 
 # Optional PDF export - ReportLab is installed and working
 REPORTLAB = True
-A4 = canvas = cm = ImageReader = HexColor = getSampleStyleSheet = ParagraphStyle = SimpleDocTemplate = Paragraph = Spacer = Table = TableStyle = colors = None
 
 # Import ReportLab modules
+from reportlab import rl_config
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 from reportlab.lib.units import cm
 from reportlab.lib.utils import ImageReader
-from reportlab.lib.colors import HexColor
+from reportlab.lib.colors import HexColor, white
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import (
+    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
+    Image as RLImage, KeepInFrame, ListFlowable,
+)
 from reportlab.lib import colors
 print("ReportLab successfully imported for PDF generation")
 
+# Our flowables never feed bad shapes to the validator, so skip ReportLab's
+# per-attribute shape checking on the render hot path
+rl_config.shapeChecking = 0
+
+# ---- PDF theme singletons, built once at import ----
+# Re-registering fonts and rebuilding the sample stylesheet on every
+# build_pdf call is the dominant ReportLab setup cost; the styles are
+# immutable for our purposes, so one shared copy serves every report.
+PDF_BRAND = HexColor("#1e40af")        # Indigo-900
+PDF_BRAND_LIGHT = HexColor("#3b82f6")  # Blue-500 for accents
+PDF_TEXT_MUTED = HexColor("#475569")   # Slate-600
+PDF_BG_CARD = HexColor("#f8fafc")      # Slate-50
+PDF_LINE = HexColor("#e2e8f0")         # Slate-200
+PDF_SUCCESS = HexColor("#059669")      # Emerald-600
+PDF_WARN = HexColor("#ca8a04")         # Amber-600
+
+# Try to use Inter if present (optional). Falls back silently.
+try:
+    if "Inter" not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(TTFont("Inter", "Inter-Regular.ttf"))
+        pdfmetrics.registerFont(TTFont("Inter-Bold", "Inter-Bold.ttf"))
+    PDF_BASE_FONT = "Inter"
+    PDF_BOLD_FONT = "Inter-Bold"
+except Exception:
+    PDF_BASE_FONT = "Helvetica"
+    PDF_BOLD_FONT = "Helvetica-Bold"
+
+PDF_STYLES = getSampleStyleSheet()
+PDF_STYLES.add(ParagraphStyle(
+    name="TitleBrand",
+    parent=PDF_STYLES["Heading1"],
+    fontName=PDF_BOLD_FONT,
+    fontSize=20,
+    leading=24,
+    textColor=white,
+    alignment=0
+))
+PDF_STYLES.add(ParagraphStyle(
+    name="SubBrand",
+    parent=PDF_STYLES["Heading3"],
+    fontName=PDF_BASE_FONT,
+    fontSize=10.5,
+    leading=14,
+    textColor=white,
+))
+PDF_STYLES.add(ParagraphStyle(
+    name="HSection",
+    parent=PDF_STYLES["Heading2"],
+    fontName=PDF_BOLD_FONT,
+    fontSize=12.5,
+    leading=16,
+    textColor=PDF_BRAND
+))
+PDF_STYLES.add(ParagraphStyle(
+    name="NormalMuted",
+    parent=PDF_STYLES["Normal"],
+    fontName=PDF_BASE_FONT,
+    fontSize=9.8,
+    leading=13,
+    textColor=PDF_TEXT_MUTED
+))
+PDF_STYLES.add(ParagraphStyle(
+    name="Hero",
+    parent=PDF_STYLES["Normal"],
+    fontName=PDF_BOLD_FONT,
+    fontSize=22,
+    leading=26,
+    textColor=PDF_BRAND
+))
+PDF_STYLES.add(ParagraphStyle(
+    name="Badge",
+    parent=PDF_STYLES["Normal"],
+    fontName=PDF_BOLD_FONT,
+    fontSize=8.8,
+    textColor=white
+))
+
 
 # ────────────────────────────────────────────────────────────────────────────────
 # GLOBAL STATE (safe defaults)
 # ────────────────────────────────────────────────────────────────────────────────
 
 def _init_state():
-    st.session_state.setdefault("page", "home")
+    st.session_state.setdefault("page", st.query_params.get("page", "home"))
     st.session_state.setdefault("image_features", {})
     st.session_state.setdefault("prediction", {})
     st.session_state.setdefault("inputs", {})
     st.session_state.setdefault("uploaded_image", None)          # PIL image
+    st.session_state.setdefault("uploaded_image_bytes", None)    # downscaled WEBP bytes
     st.session_state.setdefault("uploaded_file_raw", None)       # original uploader object
     st.session_state.setdefault("colorfulness_score", 0.0)
     st.session_state.setdefault("svd_entropy", 0.0)
@@ -84,6 +245,7 @@ def _init_state():
 def clear_image_state():
     """Clear all image-related state consistently"""
     st.session_state.uploaded_image = None
+    st.session_state.uploaded_image_bytes = None
     st.session_state.uploaded_file_raw = None
     st.session_state.image_features = {}
     st.session_state.colorfulness_score = 0.0
@@ -96,370 +258,89 @@ _init_state()
 # THEME & CSS
 # ────────────────────────────────────────────────────────────────────────────────
 
-st.markdown(
-    """
-<style>
-:root{
-  --bg-1:#0b1220; --bg-2:#0e1626; --card:#0f172a; --muted:#9fb0c7; --text:#e5e7eb;
-  --accent:#60a5fa; --accent2:#22d3ee; --accent3:#10b981; --warn:#f59e0b; --pink:#a23b72;
-  --shadow:0 20px 60px rgba(0,0,0,.35); --radius:18px;
-}
-html, body { background: linear-gradient(180deg,var(--bg-1),var(--bg-2)); }
-.block-container { padding-top: 1.3rem; }
-.glass {
-  background: linear-gradient(180deg, rgba(17,24,39,.75), rgba(15,23,42,.6));
-  border: 1px solid rgba(255,255,255,.08); border-radius: var(--radius); box-shadow: var(--shadow);
-}
-.hero {
-  height: 72vh; display:flex; align-items:center; justify-content:center;
-  border-radius: var(--radius); position: relative; overflow: hidden;
-  background:
-    radial-gradient(60rem 60rem at -10% -10%, rgba(96,165,250,.18) 0%, transparent 40%),
-    radial-gradient(60rem 60rem at 110% 110%, rgba(34,211,238,.18) 0%, transparent 40%),
-    linear-gradient(135deg, rgba(59,130,246,.25), rgba(162,59,114,.35)),
-    url('img/night.jpg');
-  background-size: cover;
-  background-position: center;
-  background-repeat: no-repeat;
-  border: 1px solid rgba(255,255,255,.08);
-  box-shadow: var(--shadow);
-}
-.hero h1 { color: var(--text); font-weight: 800; font-size: 3.5rem; margin: .2rem 0 .6rem }
-.hero p  { color: var(--muted); font-size: 1.15rem; max-width: 720px; margin: 0 auto }
-.pill { display:inline-flex; gap:.5rem; align-items:center; padding:.5rem .9rem; border-radius:999px;
-  border:1px solid rgba(255,255,255,.15); color:#dbeafe; background:rgba(59,130,246,.18) }
-.kv { background: rgba(17,24,39,.65); border:1px solid rgba(255,255,255,.08); border-radius:12px; padding:12px }
-.kv .k { color: var(--muted); font-size: .75rem; text-transform: uppercase; letter-spacing: .4px; margin-bottom:6px}
-.kv .v { color: var(--text) }
-.metric-card, .prediction-card {
-  background: linear-gradient(180deg, rgba(17,24,39,.85), rgba(15,23,42,.7));
-  border: 1px solid rgba(255,255,255,.08); border-radius: 16px; padding: 20px; box-shadow: var(--shadow);
-}
-.big-number { font-weight: 800; font-size: 2.3rem; letter-spacing: .4px; color: var(--text); }
-.badge { display:inline-block; padding:.4rem .7rem; border-radius:999px; border:1px solid #164e3d;
-  background:#0b1f17; color:#9ef6d6; font-weight:600; font-size:2rem; letter-spacing:.3px }
-.navbar { display:flex; align-items:center; justify-content:space-between; gap:12px; margin-bottom: 1rem }
-.navbar .brand { font-weight:800; font-size:2.5rem !important; color:#cfe2ff; letter-spacing:.3px }
-.btn {
-  display:inline-flex; align-items:center; justify-content:center; gap:.5rem; cursor:pointer;
-  padding:.7rem 1.1rem; border-radius:12px; border:1px solid rgba(255,255,255,.12);
-  background: linear-gradient(180deg, rgba(46,134,171,.35), rgba(162,59,114,.35));
-  color: white; text-decoration:none; transition: .18s ease;
-}
-.btn:hover{ transform: translateY(-1px); box-shadow: 0 10px 30px rgba(46,134,171,.25) }
-.section-title { color: var(--text); font-weight: 700; font-size: 1.25rem; margin: .3rem 0 .8rem }
-.hr { height:1px; background:linear-gradient(90deg, transparent, rgba(255,255,255,.1), transparent); margin: .7rem 0 1rem }
-.footer { color: var(--muted); font-size: .85rem; text-align:center; margin-top: 1.2rem }
-
-/* --- Team cards: center image perfectly --- */
-.team-card{
-  display:flex; flex-direction:column; align-items:center; gap:10px;
-  padding:15px; background:rgba(17,24,39,.65);
-  border:1px solid rgba(255,255,255,.08); border-radius:12px; margin:10px 0;
-}
-.team-photo-wrap{
-  width:160px; height:200px; border-radius:12px; overflow:hidden;
-  display:flex; align-items:center; justify-content:center;
-  background:rgba(2,6,23,.35);
-}
-.team-photo-wrap img{
-  max-width:100%; max-height:100%; object-fit:cover; display:block;
-}
-.team-name{ font-weight:700; color:#e5e7eb; }
-.team-id{ font-style:italic; color:#9fb0c7; }
-
-/* --- Prediction box styling --- */
-.pred-box{
-  padding:20px 24px;border-radius:16px;
-  background:linear-gradient(180deg, rgba(17,24,39,.85), rgba(15,23,42,.72));
-  border:2px solid rgba(255,255,255,.15); box-shadow:var(--shadow);
-  margin:20px 0;
-}
-.pred-amount{font-weight:900;font-size:2rem;letter-spacing:.3px;color:var(--text);margin:0}
-.pred-sub{display:flex;gap:10px;align-items:center;margin-top:6px;flex-wrap:wrap}
-.pred-badge{display:inline-block;padding:.35rem .65rem;border-radius:999px;border:1px solid #164e3d;background:#0b1f17;color:#9ef6d6;font-weight:700;font-size:2rem}
-.pred-meta{color:var(--muted);font-size:2rem}
-
-.range-wrap{margin:14px 0 6px}
-.range-scale{display:flex;justify-content:space-between;color:var(--muted);font-size:1.2rem;font-weight:600;margin-bottom:6px}
-.range-bar{
-  position:relative;height:12px;border-radius:999px;
-  background:linear-gradient(90deg,#314255 0%, #4b6b8e 40%, #5f87b0 60%, #7cb6ff 100%);
-  box-shadow:inset 0 0 0 1px rgba(255,255,255,.08);
-}
-.range-star{
-  position:absolute;top:50%;
-  transform:translate(-50%,-60%);
-  font-size:28px;line-height:1;
-  color:#d4af37;
-  filter:drop-shadow(0 3px 8px rgba(0,0,0,.55));
-}
-.center-img{display:flex;justify-content:center;margin:24px 0}
-
-/* Center wrapper below the hero card */
-.hero-cta{
-  width:100%;
-  display:flex;
-  justify-content:center;
-  align-items:center;
-  margin: 28px 0 10px;
-}
-
-/* Big light blue CTA — same size as the H1 (3.5rem), centered */
-.hero-cta-btn{
-  display:block;
-  width:min(640px, 90%);
-  height:86px;
-  line-height:86px;          /* vertical centering of the text */
-  text-align:center;
-  text-decoration:none;
-  font-size:2.5rem;          /* matches .hero h1 size */
-  font-weight:800;
-  border-radius:20px;
-  border:2px solid rgba(255,255,255,.2);
-  color:#fff;
-  background:#322540;        /* darker purple */
-  box-shadow:0 22px 60px rgba(76,29,149,.38);
-}
-
-.hero-cta-btn:hover{
-  transform:translateY(-2px);
-  background:#1f2e52;        /* even darker purple on hover */
-  box-shadow:0 26px 70px rgba(76,29,149,.48);
-}
-
-.hero-cta-btn,
-.hero-cta-btn:hover,
-.hero-cta-btn:focus,
-.hero-cta-btn:active {
-  text-decoration: none !important;
-  outline: none;                   /* optional: hides focus ring */
-  text-underline-offset: 0 !important;
-  text-decoration-thickness: 0 !important;
-}
-
-/* Range scale text & star bigger */
-.range-scale{
-  display:flex;justify-content:space-between;
-  color:var(--text);font-weight:800;font-size:2rem;margin-bottom:6px
-}
-.range-star{ font-size:64px; }
-
-/* Center the "📸 Image Upload & Analysis" block heading */
-.center-title{ text-align:center; }
-
-/* --- Prediction box styling --- */
-.pred-box{
-  padding:20px 24px;border-radius:16px;
-  background:linear-gradient(180deg, rgba(17,24,39,.85), rgba(15,23,42,.72));
-  border:2px solid rgba(255,255,255,.15); box-shadow:var(--shadow);
-  margin:20px 0;
-}
-.pred-amount{font-weight:900;font-size:2rem;letter-spacing:.3px;color:var(--text);margin:0}
-.pred-sub{display:flex;gap:10px;align-items:center;margin-top:6px;flex-wrap:wrap}
-.pred-badge{display:inline-block;padding:.25rem .45rem;border-radius:999px;border:1px solid #164e3d;background:#0b1f17;color:#9ef6d6;font-weight:700;font-size:2rem}
-.pred-meta{color:var(--muted);font-size:2rem}
-
-.range-wrap{margin:14px 0 6px}
+# Theme stylesheet lives in theme.css so editors get CSS tooling and the
+# Python module stays readable; read once at import, injected once per
+# process by _css_injector below.
+_CSS = (Path(__file__).with_name("theme.css")).read_text(encoding="utf-8")
 
-@media (max-width: 900px){ .hero{height:auto; padding: 60px 18px} .hero h1{font-size: 2.4rem} }
-
-/* Navbar brand styling with ID selector (high specificity) */
-#artifex-brand {
-  font-size: 2rem !important;
-  font-weight: 800 !important;
-  color: #cfe2ff;
-  letter-spacing: .3px;
-}
-
-/* Progress indicator styling */
-.progress-step{
-  text-align: center;
-  padding: 8px;
-  border-radius: 8px;
-  font-weight: 600;
-  transition: all 0.3s ease;
-}
-.progress-step.active{
-  background: rgba(96,165,250,.2);
-  color: #60a5fa;
-}
-.progress-step.inactive{
-  background: rgba(255,255,255,.05);
-  color: #9fb0c7;
-}
-
-/* Form validation styling */
-.stAlert{
-  border-radius: 8px;
-  border: 1px solid;
-}
-.stAlert[data-testid="alert"]{
-  border-radius: 8px;
-}
-
-/* Button improvements */
-.stButton > button {
-  border-radius: 8px;
-  transition: all 0.2s ease;
-}
-.stButton > button:hover {
-  transform: translateY(-1px);
-  box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-}
+@st.cache_resource
+def _css_injector() -> bool:
+    """Inject the theme CSS once per process; cache replay re-emits it on reruns."""
+    st.markdown(f"<style>{_CSS}</style>", unsafe_allow_html=True)
+    return True
 
-/* Input field improvements */
-.stNumberInput > div > div > input {
-  border-radius: 8px;
-}
-.stSelectbox > div > div > div {
-  border-radius: 8px;
-}
-.stTextInput > div > div > input {
-  border-radius: 8px;
-}
-
-/* Placeholder styling */
-.stTextInput > div > div > input::placeholder {
-  color: #9fb0c7 !important;
-  opacity: 0.8;
-  font-style: italic;
-}
-
-.stNumberInput > div > div > input::placeholder {
-  color: #9fb0c7 !important;
-  opacity: 0.8;
-  font-style: italic;
-}
-
-/* Selectbox placeholder styling */
-.stSelectbox > div > div > div[data-baseweb="select"] > div {
-  color: #9fb0c7;
-}
-
-/* Make empty selectbox options look like placeholders */
-.stSelectbox > div > div > div[data-baseweb="select"] > div:first-child {
-  color: #9fb0c7;
-  font-style: italic;
-}
-
-/* CM-perfect hero (scoped) */
-.hero-cm {
-  width: 20cm;                /* gradient box width  */
-  height: 10cm;               /* gradient box height */
-  margin: 0 auto;
-  position: relative;
-  overflow: hidden;
-  border-radius: 18px;
-  border: 1px solid rgba(255,255,255,.10);
-  box-shadow: 0 10px 40px rgba(0,0,0,.35);
-  /* 3) Gradient background (bottom layer) */
-  background:
-    radial-gradient(60rem 60rem at -10% -10%, rgba(96,165,250,.18) 0%, transparent 40%),
-    radial-gradient(60rem 60rem at 110% 110%, rgba(34,211,238,.18) 0%, transparent 40%),
-    linear-gradient(135deg, rgba(59,130,246,.25), rgba(162,59,114,.35));
-}
-
-/* New centered container with 8cm width and 18cm height */
-.hero-new {
-  width: 8cm;                 /* 8cm width */
-  height: 18cm;               /* 18cm height */
-  margin: 0 auto;             /* center align */
-  position: relative;
-  overflow: hidden;
-  border-radius: 18px;
-  border: 1px solid rgba(255,255,255,.10);
-  box-shadow: 0 10px 40px rgba(0,0,0,.35);
-  z-index: 2;                 /* appear above other elements */
-  /* Night image background with blue-purple gradient overlay */
-  background:
-    radial-gradient(60rem 60rem at -10% -10%, rgba(96,165,250,.18) 0%, transparent 40%),
-    radial-gradient(60rem 60rem at 110% 110%, rgba(34,211,238,.18) 0%, transparent 40%),
-    linear-gradient(135deg, rgba(59,130,246,.25), rgba(162,59,114,.35)),
-    url('img/night.jpg');
-  background-size: cover;
-  background-position: center;
-  background-repeat: no-repeat;
-}
-
-/* Outer container that wraps the hero section - larger than the image */
-.outer-hero-wrapper {
-  padding: 40px;              /* Large padding around the hero */
-  background: linear-gradient(135deg, rgba(30, 41, 59, 0.9), rgba(55, 48, 163, 0.8), rgba(79, 70, 229, 0.7));  /* Dark blue-purple gradient */
-  border-radius: 24px;        /* Larger border radius */
-  border: 1px solid rgba(255,255,255,.08);
-  box-shadow: 0 15px 50px rgba(0,0,0,.4);
-  margin: 30px auto;          /* Center and add vertical margin */
-  max-width: 1400px;          /* Larger max width */
-  display: flex;
-  justify-content: center;
-  align-items: center;
-  position: relative;
-  z-index: 1;
-}
+# ────────────────────────────────────────────────────────────────────────────────
+# HELPERS
+# ────────────────────────────────────────────────────────────────────────────────
 
-.hero-cm .hero-pic {
-  /* 2) Picture layer — 19×9 cm, centered */
-  position: absolute;
-  top: 0.5cm;                 /* gap from the top */
-  left: 50%;
-  transform: translateX(-50%);
-  width: 19cm;
-  height: 9cm;
-  object-fit: cover;
-  border-radius: 12px;
-  box-shadow: 0 6px 18px rgba(0,0,0,.35);
-  z-index: 2;
-}
+def go(page: str, rerun: bool = False):
+    """Route to a page via session state, mirrored into the URL query params.
 
-.hero-cm .hero-info {
-  /* 1) Information box — sits above picture */
-  position: relative;
-  z-index: 3;
-  text-align: center;
-  color: #eaeaea;
-  /* push content below the image footprint (0.5cm + 9cm + 0.2cm) */
-  padding-top: calc(0.5cm + 9cm + 0.2cm);
-  padding-left: 0.6cm;
-  padding-right: 0.6cm;
-}
+    Navbar clicks already run before the router dispatches, so the click's
+    own rerun is enough there; call sites inside page bodies (after
+    dispatch) pass rerun=True, since only they still need the forced
+    rerun. Mirroring into query params keeps the location bookmarkable.
+    """
+    st.session_state.page = page
+    st.query_params["page"] = page
+    if rerun:
+        st.rerun()
 
-.hero-cm .pill {
-  display:inline-flex; gap:.5rem; align-items:center;
-  padding:.5rem .9rem; border-radius:999px;
-  border:1px solid rgba(255,255,255,.15);
-  color:#dbeafe; background:rgba(59,130,246,.18);
-}
-.hero-cm h1 { margin: 8px 0 10px; font-size: clamp(22px, 3.2vw, 34px); line-height: 1.15; color:#fff; }
-.hero-cm p  { margin: 0 auto; max-width: 18cm; font-size: 15px; opacity:.95; }
+@st.cache_data(ttl=300, show_spinner=False)
+def get_model_info(model_info_url: str) -> Optional[Dict[str, Any]]:
+    """Fetch /model/info, held for 5 minutes.
 
-/* Gentle responsive scale for narrow viewports so cm layout doesn't overflow */
-@media (max-width: 1200px){
-  .hero-cm { transform: scale(.85); transform-origin: top center; }
-}
-@media (max-width: 900px){
-  .hero-cm { transform: scale(.72); }
-}
-</style>
-""",
-    unsafe_allow_html=True,
-)
+    Model metadata only changes on deploy, so there is no point refetching
+    it at the health probe's cadence.
+    """
+    try:
+        mi = get_session().get(model_info_url, timeout=2)
+        if mi.status_code == 200:
+            return mi.json()
+    except Exception:
+        pass  # model info is optional; callers treat None as absent
+    return None
 
-# ────────────────────────────────────────────────────────────────────────────────
-# HELPERS
-# ────────────────────────────────────────────────────────────────────────────────
+@st.cache_data(ttl=10, show_spinner=False)
+def check_api_health(health_url: str, model_info_url: str) -> Dict[str, Any]:
+    """Probe the backend health endpoint, attaching cached model info.
 
-def go(page: str):
-    st.session_state.page = page
-    st.rerun()
+    Cached for 10s so reruns don't block on HTTP; when both caches are cold
+    the model-info leg is overlapped on the executor, so the wait is
+    max(latency) not the sum.
+    """
+    fut_mi = get_executor().submit(get_model_info, model_info_url)
+    try:
+        r = get_session().get(health_url, timeout=2)
+        if r.status_code != 200:
+            return {"success": False, "error": f"Backend responding with status {r.status_code}"}
+        status = {"success": True, "data": r.json(), "model_info": None}
+    except Exception as e:
+        return {"success": False, "error": str(e)[:50]}
+    try:
+        status["model_info"] = fut_mi.result()
+    except Exception:
+        pass  # model info is optional; health already answered
+    return status
 
-def validate_image_file(uploaded_file) -> Tuple[bool, str]:
-    if uploaded_file is None:
+def validate_image_bytes(raw: Optional[bytes], content_type: str) -> Tuple[bool, str]:
+    if not raw:
         return False, "No file uploaded."
-    if uploaded_file.size > config.MAX_FILE_SIZE:
+    if len(raw) > config.MAX_FILE_SIZE:
         return False, f"File too large. Max size: {config.MAX_FILE_SIZE//(1024*1024)}MB"
-    if uploaded_file.type not in config.ALLOWED_IMAGE_TYPES:
+    if content_type not in config.ALLOWED_IMAGE_TYPES:
         return False, f"Invalid file type. Allowed: {', '.join(config.ALLOWED_IMAGE_TYPES)}"
+    # Cheap local header parse: a corrupt or mislabeled file is rejected
+    # here instead of paying the multipart upload and a backend decode
+    try:
+        from PIL import Image
+        with Image.open(io.BytesIO(raw)) as im:
+            width, height = im.size
+            im.verify()
+    except Exception:
+        return False, "File is not a readable image."
+    if width > 10000 or height > 10000:
+        return False, f"Image dimensions too large ({width}×{height}px). Max 10000px per side."
     return True, "OK"
 
 def validate_form_inputs(artist: str, year: int, width: float, height: float, 
@@ -503,78 +384,283 @@ def validate_form_inputs(artist: str, year: int, width: float, height: float,
     
     return len(errors) == 0, errors
 
-def analyze_image(uploaded_file) -> Dict[str, Any]:
-    """Analyze image with retry mechanism and better user feedback"""
+def _downscale_for_analysis(uploaded_file) -> io.BytesIO:
+    """Resize to max 1024px on the long edge and recompress as JPEG.
+
+    Colorfulness/SVD entropy don't need full resolution, so shrinking a
+    phone photo before upload cuts both bandwidth and server-side SVD work.
+    """
+    from PIL import Image  # deferred: only needed once an image is uploaded
+    img = Image.open(uploaded_file)
+    img.thumbnail((1024, 1024), Image.LANCZOS)
+    buf = io.BytesIO()
+    img.convert("RGB").save(buf, format="JPEG", quality=85, optimize=True)
+    buf.seek(0)
+    return buf
+
+def _content_key(data: bytes) -> str:
+    """Content fingerprint for cache keys: BLAKE2b with a 16-byte digest.
+
+    Hashes multi-megabyte uploads noticeably faster than SHA-256 while
+    staying collision-safe at cache-key strength.
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def _error_snippet(r) -> str:
+    """First 512 bytes of an error body, decoded leniently.
+
+    Avoids buffering an arbitrarily large error page into a Python string
+    just to embed it in a Streamlit error node.
+    """
+    return r.content[:512].decode("utf-8", errors="replace")
+
+def _validation_detail(r) -> str:
+    """Detail from a 422 JSON body, falling back to a truncated raw snippet."""
+    try:
+        return str(r.json().get("detail", ""))[:512]
+    except ValueError:
+        return _error_snippet(r)
+
+class BackendError(Exception):
+    """Backend call failure carrying the user-facing error message.
+
+    Raised inside cached functions so Streamlit never memoizes a failure
+    envelope — a transient timeout or cold-start 502 must not pin an
+    error for the cache TTL. Wrappers translate it back to the
+    {"success": False, "error": ...} shape the UI expects.
+    """
+
+def _post_multipart(url: str, fields: Dict[str, Any]) -> requests.Response:
+    """POST multipart fields, streaming the body when the encoder is present.
+
+    With MultipartEncoder the body leaves in chunks, so the upload never
+    exists twice in memory and the backend starts decoding while later
+    chunks are still being read; without it, fall back to requests'
+    buffered files= path. Tuple-valued fields are file parts.
+
+    The streamed body is a one-shot iterator the adapter layer cannot
+    rewind, so it goes through get_upload_session (no status retries) and
+    transient 502/503/504s — the usual Space cold-start responses — are
+    re-issued here with a fresh encoder after rewinding the file parts.
+    """
+    if MultipartEncoder is None:
+        files = {k: v for k, v in fields.items() if isinstance(v, tuple)}
+        data = {k: v for k, v in fields.items() if not isinstance(v, tuple)}
+        return get_session().post(url, data=data or None, files=files, timeout=config.REQUEST_TIMEOUT)
     for attempt in range(config.RETRY_ATTEMPTS):
-        try:
-            uploaded_file.seek(0)
-            files = {"file": (uploaded_file.name, uploaded_file, uploaded_file.type)}
-            
-            # Show retry attempt info
-            if attempt > 0:
-                st.info(f"🔄 Retry attempt {attempt + 1}/{config.RETRY_ATTEMPTS}...")
-            
-            r = requests.post(API["analyze_image"], files=files, timeout=config.REQUEST_TIMEOUT)
-
-            if r.status_code == 200:
-                data = r.json()
-                # Validate response data
-                if not isinstance(data, dict) or 'colorfulness_score' not in data or 'svd_entropy' not in data:
-                    return {"success": False, "error": "Invalid response from image analysis service"}
-                return {"success": True, "data": data}
-            elif r.status_code == 503:
-                return {"success": False, "error": "Image processing not available. Please try again later."}
-            elif r.status_code == 422:
-                return {"success": False, "error": f"Invalid image format: {r.text}"}
-            else:
-                return {"success": False, "error": f"Server Error {r.status_code}: {r.text}"}
+        m = MultipartEncoder(fields=fields)
+        r = get_upload_session().post(
+            url, data=m, headers={"Content-Type": m.content_type},
+            timeout=config.REQUEST_TIMEOUT,
+        )
+        if r.status_code not in (502, 503, 504) or attempt == config.RETRY_ATTEMPTS - 1:
+            return r
+        for v in fields.values():
+            if isinstance(v, tuple):
+                v[1].seek(0)
+        time.sleep(0.2 * (2 ** attempt))  # match the main adapter's backoff curve
+    return r
+
+def _post_analyze(raw: bytes, filename: str, content_type: str) -> Dict[str, Any]:
+    """POST image bytes to /analyze-image.
+
+    Retries with backoff live in the session's urllib3 adapter, so this
+    issues exactly one logical call.
+    """
+    try:
+        if len(raw) >= 512 * 1024:
+            buf = _downscale_for_analysis(io.BytesIO(raw))
+            fields = {"file": ("resized.jpg", buf, "image/jpeg")}
+        else:
+            fields = {"file": (filename, io.BytesIO(raw), content_type)}
+
+        r = _post_multipart(API["analyze_image"], fields)
+
+        if r.status_code == 200:
+            data = r.json()
+            # Validate response data
+            if not isinstance(data, dict) or 'colorfulness_score' not in data or 'svd_entropy' not in data:
+                return {"success": False, "error": "Invalid response from image analysis service"}
+            return {"success": True, "data": data}
+        elif r.status_code == 503:
+            return {"success": False, "error": "Image processing not available. Please try again later."}
+        elif r.status_code == 422:
+            return {"success": False, "error": f"Invalid image format: {_validation_detail(r)}"}
+        else:
+            return {"success": False, "error": f"Server Error {r.status_code}: {_error_snippet(r)}"}
 
-        except requests.exceptions.Timeout:
-            if attempt == config.RETRY_ATTEMPTS - 1:
-                return {"success": False, "error": "Image analysis timed out after multiple attempts."}
-            time.sleep(1)  # wait before retry
+    except requests.exceptions.Timeout:
+        return {"success": False, "error": "Image analysis timed out after multiple attempts."}
 
-        except requests.exceptions.ConnectionError:
-            return {"success": False, "error": "Cannot connect to backend. Please check if the API is running."}
+    except requests.exceptions.ConnectionError:
+        return {"success": False, "error": "Cannot connect to backend. Please check if the API is running."}
 
-        except Exception as e:
-            return {"success": False, "error": f"Unexpected error: {str(e)}"}
-    
-    return {"success": False, "error": "Failed after multiple attempts."}
+    except Exception as e:
+        return {"success": False, "error": f"Unexpected error: {str(e)}"}
+
+@st.cache_data(show_spinner=False)
+def _thumb(sha: str, data: bytes) -> bytes:
+    """Downsampled preview bytes, cached by content hash.
+
+    Passing bytes to st.image skips the per-rerun PIL decode and Streamlit's
+    re-encoding of the full-resolution upload. WEBP at quality 85 is both
+    smaller over the websocket and cheaper to decode than PNG of the same
+    artwork; PNG remains as a fallback for Pillow builds without WEBP.
+    """
+    from PIL import Image
+    img = Image.open(io.BytesIO(data))
+    img.thumbnail((1024, 1024), Image.LANCZOS)
+    buf = io.BytesIO()
+    try:
+        img.save(buf, "WEBP", quality=85, method=4)
+    except Exception:
+        buf = io.BytesIO()
+        img.save(buf, "PNG", optimize=True)
+    return buf.getvalue()
+
+def _preview_image():
+    """Best available preview: cached thumbnail if raw bytes exist, else the PIL image."""
+    raw_file = st.session_state.uploaded_file_raw
+    if raw_file is not None:
+        data = raw_file.getvalue()
+        return _thumb(_content_key(data), data)
+    return st.session_state.uploaded_image
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _analyze_bytes_cached(sha: str, raw: bytes, filename: str, content_type: str) -> Dict[str, Any]:
+    """Memoized analysis keyed on the image content hash.
+
+    Re-analyzing the same artwork becomes a cache lookup instead of a full
+    upload + SVD round-trip. Failures raise BackendError so they never
+    enter the cache — a brief backend outage must not pin an error on
+    this image for the whole TTL.
+    """
+    res = _post_analyze(raw, filename, content_type)
+    if not res.get("success"):
+        raise BackendError(res.get("error", "Image analysis failed"))
+    return res
+
+def analyze_image_bytes(raw: bytes, filename: str, content_type: str) -> Dict[str, Any]:
+    """Analyze image bytes, memoized by their content fingerprint."""
+    sha = _content_key(raw)
+    st.session_state["image_sha"] = sha
+    try:
+        return _analyze_bytes_cached(sha, raw, filename, content_type)
+    except BackendError as e:
+        return {"success": False, "error": str(e)}
+
+def analyze_image(uploaded_file) -> Dict[str, Any]:
+    """Analyze an uploaded image; reads its bytes exactly once."""
+    return analyze_image_bytes(uploaded_file.getvalue(), uploaded_file.name, uploaded_file.type)
+
+def _payload_key(payload: Dict[str, Any]) -> str:
+    """Canonical compact JSON for a payload: stable across dict ordering."""
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"))
 
 def predict_price(payload: Dict[str, Any]) -> Dict[str, Any]:
-    """Predict price with retry mechanism and better user feedback"""
-    for attempt in range(config.RETRY_ATTEMPTS):
-        try:
-            # Show retry attempt info
-            if attempt > 0:
-                st.info(f"🔄 Retry attempt {attempt + 1}/{config.RETRY_ATTEMPTS}...")
-            
-            r = requests.post(API["predict"], json=payload, timeout=config.REQUEST_TIMEOUT)
-
-            if r.status_code == 200:
-                data = r.json()
-                if not isinstance(data, dict) or 'predicted_price' not in data:
-                    return {"success": False, "error": "Invalid response from prediction service"}
-                return {"success": True, "data": data}
-            elif r.status_code == 422:
-                return {"success": False, "error": f"Validation Error: {r.text}"}
-            elif r.status_code == 503:
-                return {"success": False, "error": "Model not loaded. Please try again later."}
-            else:
-                return {"success": False, "error": f"Server Error {r.status_code}: {r.text}"}
-        except requests.exceptions.Timeout:
-            if attempt == config.RETRY_ATTEMPTS - 1:
-                return {"success": False, "error": "Prediction timed out after multiple attempts."}
-            time.sleep(1)
+    """Predict price, memoized on the canonical payload JSON.
 
-        except requests.exceptions.ConnectionError:
-            return {"success": False, "error": "Cannot connect to backend. Please check if the API is running."}
+    Only successes are memoized: failures raise out of the cached
+    function and are translated to the error envelope here, so the next
+    click re-contacts the backend instead of replaying a stale error.
+    """
+    try:
+        return _predict_cached(_payload_key(payload))
+    except BackendError as e:
+        return {"success": False, "error": str(e)}
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _predict_cached(payload_key: str) -> Dict[str, Any]:
+    """POST /predict keyed on the canonical payload JSON.
+
+    The key doubles as the request body, so an unchanged form is a pure
+    cache hit and a changed one serializes exactly once; the session
+    adapter handles retries with backoff. Failures raise BackendError so
+    they never enter the cache.
+    """
+    try:
+        r = get_session().post(
+            API["predict"], data=payload_key,
+            headers={"Content-Type": "application/json"},
+            timeout=config.REQUEST_TIMEOUT,
+        )
+    except requests.exceptions.Timeout:
+        raise BackendError("Prediction timed out after multiple attempts.")
+    except requests.exceptions.ConnectionError:
+        raise BackendError("Cannot connect to backend. Please check if the API is running.")
+    except Exception as e:
+        raise BackendError(f"Unexpected error: {str(e)}")
+
+    if r.status_code == 200:
+        data = r.json()
+        if not isinstance(data, dict) or 'predicted_price' not in data:
+            raise BackendError("Invalid response from prediction service")
+        return {"success": True, "data": data}
+    elif r.status_code == 422:
+        raise BackendError(f"Validation Error: {_validation_detail(r)}")
+    elif r.status_code == 503:
+        raise BackendError("Model not loaded. Please try again later.")
+    else:
+        raise BackendError(f"Server Error {r.status_code}: {_error_snippet(r)}")
 
-        except Exception as e:
-            return {"success": False, "error": f"Unexpected error: {str(e)}"}
-    
-    return {"success": False, "error": "Failed after multiple attempts."}
+def predict_with_image(payload: Dict[str, Any], uploaded_file) -> Dict[str, Any]:
+    """Predict in a single round-trip, letting the backend extract image features.
+
+    Sends the artwork details and the image together as multipart/form-data,
+    replacing the analyze-then-predict two-step for images that were never
+    analyzed separately.
+    """
+    try:
+        raw = uploaded_file.getvalue()
+        if len(raw) >= 512 * 1024:
+            buf = _downscale_for_analysis(io.BytesIO(raw))
+            fields = {"payload": json.dumps(payload), "file": ("resized.jpg", buf, "image/jpeg")}
+        else:
+            fields = {"payload": json.dumps(payload), "file": (uploaded_file.name, io.BytesIO(raw), uploaded_file.type)}
+        r = _post_multipart(API["predict_with_image"], fields)
+        if r.status_code == 200:
+            data = r.json()
+            if not isinstance(data, dict) or 'predicted_price' not in data:
+                return {"success": False, "error": "Invalid response from prediction service"}
+            return {"success": True, "data": data}
+        elif r.status_code == 422:
+            return {"success": False, "error": f"Validation Error: {_validation_detail(r)}"}
+        elif r.status_code == 503:
+            return {"success": False, "error": "Model not loaded. Please try again later."}
+        else:
+            return {"success": False, "error": f"Server Error {r.status_code}: {_error_snippet(r)}"}
+    except requests.exceptions.Timeout:
+        return {"success": False, "error": "Prediction timed out."}
+    except requests.exceptions.ConnectionError:
+        return {"success": False, "error": "Cannot connect to backend. Please check if the API is running."}
+    except Exception as e:
+        return {"success": False, "error": f"Unexpected error: {str(e)}"}
+
+def analyze_and_predict(payload: Dict[str, Any], uploaded_file) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Run image analysis and prediction concurrently for an un-analyzed upload.
+
+    The two calls are independent (the prediction path extracts its own image
+    features server-side), so firing both on the shared executor makes the
+    submit cost max(latency) instead of the sum, and the analysis result still
+    fills in the feature readouts for the results page. The analysis leg goes
+    through the content-hash memo, so re-predicting the same artwork only
+    pays for the prediction call.
+    """
+    raw = uploaded_file.getvalue()
+    # Hash and touch session_state on the script thread; only the network
+    # calls run on workers
+    sha = _content_key(raw)
+    st.session_state["image_sha"] = sha
+    fut_analyze = get_executor().submit(
+        _analyze_bytes_cached, sha, raw, uploaded_file.name, uploaded_file.type
+    )
+    fut_predict = get_executor().submit(predict_with_image, payload, uploaded_file)
+    concurrent.futures.wait([fut_analyze, fut_predict])
+    try:
+        analysis = fut_analyze.result()
+    except BackendError as e:
+        analysis = {"success": False, "error": str(e)}
+    return analysis, fut_predict.result()
 
 def calculate_title_word_count(title: str) -> int:
     if not title or title.strip().lower() == "untitled":
@@ -587,14 +673,34 @@ def price_range_text(p: Optional[float]) -> Tuple[float, float, str]:
     lo, hi = p * 0.8, p * 1.2
     return lo, hi, f"${lo:,.0f} – ${hi:,.0f}"
 
+# Bound once: re-binding "${:,.0f}".format per call re-parses the spec on
+# the PDF hot path, where fmt_money runs for every money cell
+_FMT_MONEY = "${:,.0f}".format
+
 def fmt_money(v: Optional[float]) -> str:
     try:
-        return "${:,.0f}".format(float(v))
+        return _FMT_MONEY(v if isinstance(v, (int, float)) else float(v))
     except Exception:
         return "–"
 
-def build_pdf(inputs: Dict[str, Any], result: Dict[str, Any], image: Optional[Image.Image]) -> bytes:
-    """Build a modern, one-page PDF report (ReportLab). Falls back to text if ReportLab unavailable."""
+def _kv_list(pairs) -> "ListFlowable":
+    """Render label/value pairs as a ListFlowable of Paragraphs.
+
+    Table layout cost grows super-linearly with cell count (width
+    negotiation plus per-cell style passes); a flat flowable list lays
+    these key/value rows out in a single linear pass.
+    """
+    return ListFlowable(
+        [Paragraph(f"<b>{k}:</b> {v}", PDF_STYLES["Normal"]) for k, v in pairs],
+        bulletType="bullet", bulletFontSize=6, leftIndent=10,
+    )
+
+def build_pdf(inputs: Dict[str, Any], result: Dict[str, Any], image: Optional[Any]) -> bytes:
+    """Build a modern, one-page PDF report (ReportLab). Falls back to text if ReportLab unavailable.
+
+    image may be pre-compressed bytes (preferred; embedded without
+    re-encoding) or a PIL Image.
+    """
     if not REPORTLAB:
         # Fallback: simple text report
         lines = [
@@ -620,87 +726,16 @@ def build_pdf(inputs: Dict[str, Any], result: Dict[str, Any], image: Optional[Im
 
     # ===== ReportLab version =====
     try:
-        from reportlab.platypus import (
-            SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image as RLImage, KeepInFrame
-        )
-        from reportlab.lib.pagesizes import A4
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.colors import HexColor, white
-        from reportlab.lib.units import cm
-        from reportlab.pdfbase import pdfmetrics
-        from reportlab.pdfbase.ttfonts import TTFont
-        import io
         from datetime import datetime
 
-        # ---- Colors / theme
-        brand = HexColor("#1e40af")   # Indigo-900
-        brand_light = HexColor("#3b82f6")  # Blue-500 for accents
-        text_muted = HexColor("#475569")   # Slate-600
-        bg_card = HexColor("#f8fafc")      # Slate-50
-        line = HexColor("#e2e8f0")         # Slate-200
-        success = HexColor("#059669")      # Emerald-600
-        warn = HexColor("#ca8a04")         # Amber-600
-
-        # ---- Try to use Inter or Poppins if present (optional). Falls back silently.
-        try:
-            pdfmetrics.registerFont(TTFont("Inter", "Inter-Regular.ttf"))
-            pdfmetrics.registerFont(TTFont("Inter-Bold", "Inter-Bold.ttf"))
-            base_font = "Inter"
-            bold_font = "Inter-Bold"
-        except Exception:
-            base_font = "Helvetica"
-            bold_font = "Helvetica-Bold"
-
-        # ---- Styles
-        styles = getSampleStyleSheet()
-        styles.add(ParagraphStyle(
-            name="TitleBrand",
-            parent=styles["Heading1"],
-            fontName=bold_font,
-            fontSize=20,
-            leading=24,
-            textColor=white,
-            alignment=0
-        ))
-        styles.add(ParagraphStyle(
-            name="SubBrand",
-            parent=styles["Heading3"],
-            fontName=base_font,
-            fontSize=10.5,
-            leading=14,
-            textColor=white,
-        ))
-        styles.add(ParagraphStyle(
-            name="HSection",
-            parent=styles["Heading2"],
-            fontName=bold_font,
-            fontSize=12.5,
-            leading=16,
-            textColor=brand
-        ))
-        styles.add(ParagraphStyle(
-            name="NormalMuted",
-            parent=styles["Normal"],
-            fontName=base_font,
-            fontSize=9.8,
-            leading=13,
-            textColor=text_muted
-        ))
-        styles.add(ParagraphStyle(
-            name="Hero",
-            parent=styles["Normal"],
-            fontName=bold_font,
-            fontSize=22,
-            leading=26,
-            textColor=brand
-        ))
-        styles.add(ParagraphStyle(
-            name="Badge",
-            parent=styles["Normal"],
-            fontName=bold_font,
-            fontSize=8.8,
-            textColor=white
-        ))
+        # ---- Colors / fonts / styles: module-level singletons (see top of file)
+        brand = PDF_BRAND
+        brand_light = PDF_BRAND_LIGHT
+        line = PDF_LINE
+        success = PDF_SUCCESS
+        base_font = PDF_BASE_FONT
+        bold_font = PDF_BOLD_FONT
+        styles = PDF_STYLES
 
         # ---- Header / Footer painter
         def paint_header_footer(canv, doc_):
@@ -744,36 +779,16 @@ def build_pdf(inputs: Dict[str, Any], result: Dict[str, Any], image: Optional[Im
         features_used = str(result.get("features_used", "57"))
         r2_disp = result.get("r2_display", "84.49%")  # keep existing display but let API override via r2_display
 
-        hero_rows = [
-            [
-                Paragraph("Predicted Price", styles["NormalMuted"]),
-                Paragraph(fmt_money(pred), styles["Hero"])
-            ],
-            [
-                Paragraph("Estimated Range", styles["NormalMuted"]),
-                Paragraph(rng_text, styles["Normal"])
-            ],
-            [
-                Paragraph("Confidence", styles["NormalMuted"]),
-                Paragraph(f"{confidence}", styles["Normal"])
-            ],
+        # Hero card as stacked paragraphs: the three-line card needs none of
+        # Table's width negotiation, and the outer top_block already draws
+        # the card box around it
+        hero_card = [
+            Paragraph("Predicted Price", styles["NormalMuted"]),
+            Paragraph(fmt_money(pred), styles["Hero"]),
+            Spacer(1, 4),
+            Paragraph(f"<b>Estimated Range:</b> {rng_text}", styles["Normal"]),
+            Paragraph(f"<b>Confidence:</b> {confidence}", styles["Normal"]),
         ]
-        hero_tbl = Table(
-            hero_rows,
-            colWidths=[4.1*cm, None],
-            hAlign="LEFT"
-        )
-        hero_tbl.setStyle(TableStyle([
-            ("FONTNAME", (0, 0), (-1, -1), base_font),
-            ("BACKGROUND", (0, 0), (-1, -1), bg_card),
-            ("BOX", (0, 0), (-1, -1), 0.6, line),
-            ("INNERGRID", (0, 0), (-1, -1), 0.4, line),
-            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-            ("LEFTPADDING", (0, 0), (-1, -1), 8),
-            ("RIGHTPADDING", (0, 0), (-1, -1), 8),
-            ("TOPPADDING", (0, 0), (-1, -1), 6),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
-        ]))
 
         # Badges row (model / features / R²)
         badge_style = styles["Badge"]
@@ -794,7 +809,7 @@ def build_pdf(inputs: Dict[str, Any], result: Dict[str, Any], image: Optional[Im
         badges.setStyle(TableStyle([("RIGHTPADDING", (0, 0), (-1, -1), 4)]))
 
         # Group hero card + badges
-        hero_block = [Paragraph("Prediction", styles["HSection"]), hero_tbl, Spacer(1, 4), badges]
+        hero_block = [Paragraph("Prediction", styles["HSection"]), *hero_card, Spacer(1, 4), badges]
 
         # ===== LEFT COLUMN: DETAILS & ATTRIBUTES =====
         dims = f"{float(inputs.get('width', 0) or 0):.1f} × {float(inputs.get('height', 0) or 0):.1f} cm"
@@ -809,17 +824,7 @@ def build_pdf(inputs: Dict[str, Any], result: Dict[str, Any], image: Optional[Im
             ["Condition", inputs.get("condition", "Unknown") or "Unknown"],
             ["Edition Type", inputs.get("edition_type", "Unknown") or "Unknown"],
         ]
-        details_tbl = Table(details_data, colWidths=[3.2*cm, None])
-        details_tbl.setStyle(TableStyle([
-            ("FONTNAME", (0, 0), (-1, -1), base_font),
-            ("BACKGROUND", (0, 0), (-1, -1), white),
-            ("BOX", (0, 0), (-1, -1), 0.6, line),
-            ("INNERGRID", (0, 0), (-1, -1), 0.4, line),
-            ("LEFTPADDING", (0, 0), (-1, -1), 6),
-            ("RIGHTPADDING", (0, 0), (-1, -1), 6),
-            ("TOPPADDING", (0, 0), (-1, -1), 4),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-        ]))
+        details_list = _kv_list(details_data)
 
         physical_data = [
             ["Has Edition Info", "Yes" if inputs.get("has_edition") else "No"],
@@ -827,53 +832,38 @@ def build_pdf(inputs: Dict[str, Any], result: Dict[str, Any], image: Optional[Im
             ["Has Frame", "Yes" if inputs.get("has_frame") else "No"],
             ["Has Damage", "Yes" if inputs.get("has_damage") else "No"],
         ]
-        physical_tbl = Table(physical_data, colWidths=[5.0*cm, None])
-        physical_tbl.setStyle(TableStyle([
-            ("FONTNAME", (0, 0), (-1, -1), base_font),
-            ("BACKGROUND", (0, 0), (-1, -1), bg_card),
-            ("BOX", (0, 0), (-1, -1), 0.6, line),
-            ("INNERGRID", (0, 0), (-1, -1), 0.4, line),
-            ("LEFTPADDING", (0, 0), (-1, -1), 6),
-            ("RIGHTPADDING", (0, 0), (-1, -1), 6),
-            ("TOPPADDING", (0, 0), (-1, -1), 4),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-        ]))
+        physical_list = _kv_list(physical_data)
 
         image_feats = [
             ["Colorfulness", f"{float(inputs.get('colorfulness_score', 0) or 0):.2f}"],
             ["SVD Entropy", f"{float(inputs.get('svd_entropy', 0) or 0):.2f}"],
         ]
-        image_feat_tbl = Table(image_feats, colWidths=[3.2*cm, None])
-        image_feat_tbl.setStyle(TableStyle([
-            ("FONTNAME", (0, 0), (-1, -1), base_font),
-            ("BACKGROUND", (0, 0), (-1, -1), white),
-            ("BOX", (0, 0), (-1, -1), 0.6, line),
-            ("INNERGRID", (0, 0), (-1, -1), 0.4, line),
-            ("LEFTPADDING", (0, 0), (-1, -1), 6),
-            ("RIGHTPADDING", (0, 0), (-1, -1), 6),
-            ("TOPPADDING", (0, 0), (-1, -1), 4),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-        ]))
+        image_feat_list = _kv_list(image_feats)
 
         left_col = [
             Paragraph("Artwork Details", styles["HSection"]),
-            details_tbl,
+            details_list,
             Spacer(1, 6),
             Paragraph("Physical Attributes", styles["HSection"]),
-            physical_tbl,
+            physical_list,
             Spacer(1, 6),
             Paragraph("Image Features", styles["HSection"]),
-            image_feat_tbl,
+            image_feat_list,
         ]
 
         # ===== RIGHT COLUMN: IMAGE (if provided) + TECHNICAL =====
         right_col = []
         if image is not None:
-            # Convert PIL -> ReportLab Image
-            img_io = io.BytesIO()
-            # Use JPEG to keep PDF small
-            image.convert("RGB").save(img_io, format="JPEG", quality=85)
-            img_io.seek(0)
+            if isinstance(image, bytes):
+                # Pre-compressed bytes from the upload path: embed as-is
+                # instead of re-encoding the PIL object per report
+                img_io = io.BytesIO(image)
+            else:
+                # Convert PIL -> ReportLab Image
+                img_io = io.BytesIO()
+                # Use JPEG to keep PDF small
+                image.convert("RGB").save(img_io, format="JPEG", quality=85)
+                img_io.seek(0)
             rl_img = RLImage(img_io, width=8.0*cm, height=8.0*cm, kind='proportional')
             img_card = Table([[rl_img]], colWidths=[8.0*cm])
             img_card.setStyle(TableStyle([
@@ -898,18 +888,8 @@ def build_pdf(inputs: Dict[str, Any], result: Dict[str, Any], image: Optional[Im
             except Exception:
                 tech_rows.append(["Log-space Price", str(result['log_price'])])
 
-        tech_tbl = Table(tech_rows, colWidths=[4.0*cm, None])
-        tech_tbl.setStyle(TableStyle([
-            ("FONTNAME", (0, 0), (-1, -1), base_font),
-            ("BACKGROUND", (0, 0), (-1, -1), bg_card),
-            ("BOX", (0, 0), (-1, -1), 0.6, line),
-            ("INNERGRID", (0, 0), (-1, -1), 0.4, line),
-            ("LEFTPADDING", (0, 0), (-1, -1), 6),
-            ("RIGHTPADDING", (0, 0), (-1, -1), 6),
-            ("TOPPADDING", (0, 0), (-1, -1), 4),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-        ]))
-        right_col += [Paragraph("Technical Analysis", styles["HSection"]), tech_tbl]
+        tech_list = _kv_list(tech_rows)
+        right_col += [Paragraph("Technical Analysis", styles["HSection"]), tech_list]
 
         # ===== Assemble two-column grid =====
         # Top section: hero block spanning both columns
@@ -1144,12 +1124,11 @@ def about_page():
                 try:
                     image_path = f"img/{img_file}"
                     if os.path.exists(image_path):
+                        from PIL import Image
                         image = Image.open(image_path)
                         # Resize image to fit the card
                         image.thumbnail((160, 200), Image.Resampling.LANCZOS)
                         # Convert to base64 for embedding
-                        import io
-                        import base64
                         buffer = io.BytesIO()
                         image.save(buffer, format='JPEG')
                         img_str = base64.b64encode(buffer.getvalue()).decode()
@@ -1248,7 +1227,7 @@ def about_page():
 
     st.markdown('<div class="hr"></div>', unsafe_allow_html=True)
     if st.button("🔙 Back to Home", use_container_width=True, key="about_back"):
-        go("home")
+        go("home", rerun=True)
 
 def unit_dimensions():
     section_title("📏 Physical Dimensions")
@@ -1264,7 +1243,7 @@ def unit_dimensions():
     )
     col_u, col_w, col_h = st.columns(3)
     with col_u:
-        unit = st.selectbox("Unit", ["cm", "inches"], help="Measurement unit for dimensions", key="unit")
+        unit = st.selectbox("Unit", UNITS, help="Measurement unit for dimensions", key="unit")
     with col_w:
         if unit == "cm":
             width = st.number_input(
@@ -1353,17 +1332,21 @@ def predict_page():
                 key="uploader"
             )
             if up:
-                ok, msg = validate_image_file(up)
+                raw = up.getvalue()  # read the buffer once; all consumers share it
+                ok, msg = validate_image_bytes(raw, up.type)
                 if not ok:
                     st.error(f"❌ {msg}")
                 else:
                     # Store both the raw file and processed image
+                    from PIL import Image
                     st.session_state.uploaded_file_raw = up
-                    st.session_state.uploaded_image = Image.open(up).convert("RGB")
+                    st.session_state.uploaded_image = Image.open(io.BytesIO(raw)).convert("RGB")
+                    # Downscaled WEBP once per upload; preview and PDF reuse it
+                    st.session_state.uploaded_image_bytes = _thumb(_content_key(raw), raw)
                     # Centered preview when a file was just uploaded
                     centerL, centerC, centerR = st.columns([1, 2, 1])
                     with centerC:
-                        st.image(st.session_state.uploaded_image, caption="Your Artwork", use_container_width=True)
+                        st.image(_preview_image(), caption="Your Artwork", use_container_width=True)
                     st.success("✅ Image uploaded successfully! Click 'Analyze Image' to compute features.")
                     st.rerun()
             else:
@@ -1372,7 +1355,7 @@ def predict_page():
             # Centered preview + centered stacked buttons when image already exists
             imgL, imgC, imgR = st.columns([1, 2, 1])
             with imgC:
-                st.image(st.session_state.uploaded_image, caption="Your Artwork", use_container_width=True)
+                st.image(_preview_image(), caption="Your Artwork", use_container_width=True)
 
             # Improved button layout - horizontal with better spacing
             btn_col1, btn_col2, btn_col3, btn_col4 = st.columns([1, 1, 1, 1])
@@ -1456,12 +1439,12 @@ def predict_page():
         colL, colR = st.columns(2)
         with colL:
             artist = st.text_input("Artist Name*", placeholder="e.g., Pablo Picasso", max_chars=100, help="Name of the artist who created the artwork", key="artist")
-            object_type = st.selectbox("Object Type*", ["other","painting","drawing","print","sculpture","photograph"], index=0, help="Type of artwork (painting, drawing, print, etc.)", key="object_type")
-            technique = st.selectbox("Technique*", ["other","oil on canvas","watercolor","etching","lithograph","woodcut","screenprint","painting"], index=0, help="Artistic technique or medium used", key="technique")
+            object_type = st.selectbox("Object Type*", OBJECT_TYPES, index=0, help="Type of artwork (painting, drawing, print, etc.)", key="object_type")
+            technique = st.selectbox("Technique*", TECHNIQUES, index=0, help="Artistic technique or medium used", key="technique")
         with colR:
-            signature = st.selectbox("Signature*", ["unknown","hand signed","plate signed","unsigned"], index=0, help="Whether the artwork is signed by the artist", key="signature")
-            condition = st.selectbox("Condition*", ["unknown","excellent","very good","good","fair","poor"], index=0, help="Physical condition of the artwork", key="condition")
-            edition_type = st.selectbox("Edition Type*", ["unknown","unique","numbered","limited","open"], index=0, help="Type of edition (unique piece, numbered print, etc.)", key="edition_type")
+            signature = st.selectbox("Signature*", SIGNATURES, index=0, help="Whether the artwork is signed by the artist", key="signature")
+            condition = st.selectbox("Condition*", CONDITIONS, index=0, help="Physical condition of the artwork", key="condition")
+            edition_type = st.selectbox("Edition Type*", EDITION_TYPES, index=0, help="Type of edition (unique piece, numbered print, etc.)", key="edition_type")
 
         year, width, height = unit_dimensions()
 
@@ -1537,14 +1520,36 @@ def predict_page():
             payload["colorfulness_score"] = float(st.session_state.colorfulness_score or 0.0)
             payload["svd_entropy"] = float(st.session_state.svd_entropy or 0.0)
 
-            with st.spinner("Predicting..."):
-                res = predict_price(payload)
+            input_key = _payload_key(payload)
+            if st.session_state.get("last_pred_key") == input_key and st.session_state.get("last_pred"):
+                # Inputs unchanged since the last prediction — skip the round-trip
+                res = st.session_state["last_pred"]
+            else:
+                with st.spinner("Predicting..."):
+                    raw_file = st.session_state.uploaded_file_raw
+                    not_analyzed = (
+                        st.session_state.colorfulness_score == 0.0
+                        and st.session_state.svd_entropy == 0.0
+                    )
+                    if raw_file is not None and not_analyzed:
+                        # Backend extracts image features itself; the parallel
+                        # analysis fills the feature readouts without extra wait
+                        analysis, res = analyze_and_predict(payload, raw_file)
+                        if analysis.get("success"):
+                            feats = analysis["data"] or {}
+                            payload["colorfulness_score"] = float(feats.get("colorfulness_score", 0.0))
+                            payload["svd_entropy"] = float(feats.get("svd_entropy", 0.0))
+                    else:
+                        res = predict_price(payload)
+                if res.get("success"):
+                    st.session_state["last_pred_key"] = input_key
+                    st.session_state["last_pred"] = res
 
             if res.get("success"):
                 st.session_state.prediction = res["data"]
                 st.session_state.inputs = payload
                 st.success("Prediction complete.")
-                go("results")
+                go("results", rerun=True)
             else:
                 st.error(f"Prediction failed: {res.get('error')}")
 
@@ -1555,7 +1560,7 @@ def results_page():
     if not data:
         st.info("No prediction available yet.")
         if st.button("Start a Prediction", use_container_width=True):
-            go("predict")
+            go("predict", rerun=True)
         return
 
     # ---------- helpers ----------
@@ -1872,7 +1877,10 @@ def results_page():
         if REPORTLAB:
             try:
                 with st.spinner("🔄 Generating PDF..."):
-                    pdf_bytes = build_pdf(inputs, data, st.session_state.get("uploaded_image"))
+                    pdf_bytes = build_pdf(
+                        inputs, data,
+                        st.session_state.get("uploaded_image_bytes") or st.session_state.get("uploaded_image"),
+                    )
 
                 if pdf_bytes and len(pdf_bytes) > 0:
                     st.download_button(
@@ -1898,13 +1906,13 @@ def results_page():
     b1, b2, b3 = st.columns([1, 2, 1])
     with b1:
         if st.button("🔙 Home", use_container_width=True):
-            go("home")
+            go("home", rerun=True)
     with b2:
         if st.button("🔄 New Prediction", use_container_width=True, type="primary"):
-            go("predict")
+            go("predict", rerun=True)
     with b3:
         if st.button("ℹ️ About", use_container_width=True):
-            go("about")
+            go("about", rerun=True)
 
     st.markdown('<div class="footer">© 2025 ArtifexAI — Fair-value insights for art markets</div>', unsafe_allow_html=True)
 
@@ -1914,6 +1922,8 @@ def results_page():
 # ────────────────────────────────────────────────────────────────────────────────
 
 def main():
+    _css_injector()
+
     # Sidebar: API config
     with st.sidebar:
         st.header("Settings")
@@ -1940,18 +1950,18 @@ def main():
         st.markdown("---")
         st.caption("Tip: Analyze image to auto-fill image features (Colorfulness, SVD Entropy).")
         
-        # Show current API status
+        # Show current API status (cached health probe, manual refresh)
         st.markdown("---")
         st.subheader("API Status")
-        try:
-            import requests
-            response = requests.get(API["health"], timeout=5)
-            if response.status_code == 200:
-                st.success("✅ Backend connected")
-            else:
-                st.warning("⚠️ Backend responding with errors")
-        except Exception as e:
-            st.error(f"❌ Backend not available: {str(e)[:50]}...")
+        health = check_api_health(API["health"], API["model_info"])
+        if health.get("success"):
+            st.success("✅ Backend connected")
+        else:
+            st.error(f"❌ Backend not available: {health.get('error')}...")
+        if st.button("🔄 Refresh status", key="refresh_status"):
+            check_api_health.clear()
+            get_model_info.clear()
+            st.rerun()
         
         # Show current configuration
         st.markdown("---")
@@ -11,13 +11,27 @@ import os
 def install_package(package):
     """Install a package using pip"""
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", package])
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "--prefer-binary", package])
         print(f"✅ Successfully installed {package}")
         return True
     except subprocess.CalledProcessError as e:
         print(f"❌ Failed to install {package}: {e}")
         return False
 
+def install_packages(packages):
+    """Install all packages in one pip invocation so the resolver runs once.
+
+    Falls back to per-package installs on failure for clearer error attribution.
+    """
+    try:
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "--prefer-binary", *packages])
+        print(f"✅ Successfully installed {len(packages)} packages")
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Batched install failed: {e}")
+        print("Retrying packages one at a time...")
+        return all([install_package(p) for p in packages])
+
 def main():
     print("🎨 ArtifexAI - Installing Dependencies")
     print("=" * 50)
@@ -28,7 +42,8 @@ def main():
         "requests>=2.31.0", 
         "Pillow>=10.0.0",
         "pandas>=2.0.0",
-        "numpy>=1.24.0"
+        "numpy>=1.24.0",
+        "pyarrow>=14.0.0"
     ]
     
     # Backend dependencies
@@ -51,21 +66,8 @@ def main():
         "reportlab>=4.0.0"  # For PDF generation
     ]
     
-    print("\n📦 Installing core dependencies...")
-    for package in core_packages:
-        install_package(package)
-    
-    print("\n🔧 Installing backend dependencies...")
-    for package in backend_packages:
-        install_package(package)
-    
-    print("\n🤖 Installing ML dependencies...")
-    for package in ml_packages:
-        install_package(package)
-    
-    print("\n📄 Installing optional dependencies...")
-    for package in optional_packages:
-        install_package(package)
+    print("\n📦 Installing all dependencies in one pip call...")
+    install_packages(core_packages + backend_packages + ml_packages + optional_packages)
     
     print("\n" + "=" * 50)
     print("🎉 Installation complete!")